@@ -1,23 +1,68 @@
 # commands/getroles.py
 import os
-import aiohttp
+import asyncio
+import bisect
+import orjson
 import discord
 from discord import app_commands
 from utils.checks import is_guild_admin
-from utils.role_config import load_role_config
+from utils.role_config import aload_role_config
 from utils.hypixel_api import get_sb_stats
 from utils.config import get_guild_cfg
+from utils.http import get_session
+from utils.guild_cache import role_by_name
+from utils.log_queue import enqueue_log
 from views.promotion_view import PersistentPromotionApproveView  # approval UI for discord-only mode
 
 # Read mode/bridge from environment
 PROMOTION_MODE = (os.getenv("PROMOTION_MODE") or "discord-only").strip().lower()
 PROMOTION_BRIDGE_URL = os.getenv("PROMOTION_BRIDGE_URL")
 PROMOTION_BRIDGE_TOKEN = os.getenv("PROMOTION_BRIDGE_TOKEN")  # optional
+BRIDGE_TIMEOUT = 15  # seconds for the whole bridge round-trip
 
 VALID_MODES = {"discord-only", "auto-mc"}
 if PROMOTION_MODE not in VALID_MODES:
     PROMOTION_MODE = "discord-only"  # safe default
 
+# Static bridge request parts (built once; aiohttp does not mutate headers)
+_BRIDGE_HEADERS = {"Content-Type": "application/json"}
+if PROMOTION_BRIDGE_TOKEN:
+    _BRIDGE_HEADERS["Authorization"] = f"Bearer {PROMOTION_BRIDGE_TOKEN}"
+_BRIDGE_PAYLOAD_BASE = {"action": "promote"}
+
+# Fixed user-facing responses
+_NO_RANK_MSG = "No rank mapping found for your mastery count."
+_NO_QUEUE_MSG = "No promotion queue channel set. Run `/setuppromotions #channel` first."
+_CHANNEL_INVALID_MSG = "Promotion channel invalid."
+_QUEUED_MSG = "✅ Queued promotion for approval."
+_BRIDGE_NOT_SET_MSG = "⚠ `PROMOTION_BRIDGE_URL` not set in environment."
+_UNKNOWN_MODE_MSG = f"Unknown promotion mode in env: `{PROMOTION_MODE}`. Use `discord-only` or `auto-mc`."
+
+# Stateless (reads IGN/rank from the embed), so one instance serves every queued request
+_PERSISTENT_VIEW = PersistentPromotionApproveView()
+
+def _build_promotion_embed(username, role_name, stats, mastery_count, requester) -> discord.Embed:
+    """Approval card posted to the promotion queue (parsed back by PersistentPromotionApproveView)."""
+    e = discord.Embed(
+        title="Promotion Request",
+        description=f"IGN: **{username}**\nTarget Rank: **{role_name}**",
+        color=discord.Color.green()
+    )
+    fields = (
+        ("Masteries", str(mastery_count)),
+        ("SB Level", str(stats["sb_level"])),
+        ("Skill Avg", str(stats["skill_avg"])),
+        ("Cata", str(stats["cata_lvl"])),
+        ("Slayer XP", f"{stats['slayer_xp']:,}"),
+        ("Networth", f"{stats['networth']:,}"),
+        ("Farm Weight", f"{stats['farm_weight']:,}"),
+        ("Rift Charms", "All" if stats["rift_all_charms"] else "Incomplete"),
+    )
+    for n, v in fields:
+        e.add_field(name=n, value=v)
+    e.set_footer(text=f"Requested by {requester}")
+    return e
+
 async def setup(client: discord.Client):
     tree = client.tree
 
@@ -34,9 +79,7 @@ async def setup(client: discord.Client):
         """Check stats, decide rank, and either queue approval or auto-promote via bridge."""
         await interaction.response.defer(ephemeral=True, thinking=True)
 
-        cfg_data = load_role_config()
-        reqs = cfg_data["requirements"]
-        rank_thresholds = {int(k): v for k, v in cfg_data["mastery_ranks"].items()}
+        _, thresholds_asc, ranks_asc, check_reqs = await aload_role_config()
 
         # 1) Fetch SkyBlock stats
         try:
@@ -45,97 +88,67 @@ async def setup(client: discord.Client):
             return await interaction.followup.send(f"Error fetching stats: {e}", ephemeral=True)
 
         # 2) Check requirements
-        failed = []
-        if stats["networth"] < reqs["networth"]: failed.append(f"Networth < {reqs['networth']:,}")
-        if stats["sb_level"] < reqs["sb_level"]: failed.append(f"SB Level < {reqs['sb_level']}")
-        if stats["skill_avg"] < reqs["skill_avg"]: failed.append(f"Skill Avg < {reqs['skill_avg']}")
-        if stats["slayer_xp"] < reqs["slayer_xp"]: failed.append(f"Slayer XP < {reqs['slayer_xp']:,}")
-        if stats["cata_lvl"] < reqs["cata_lvl"]: failed.append(f"Cata Lvl < {reqs['cata_lvl']}")
-        if reqs["rift_charms"] == "all" and not stats["rift_all_charms"]: failed.append("Rift charms incomplete")
-        if stats["farm_weight"] < reqs["farm_weight"]: failed.append(f"Farm Weight < {reqs['farm_weight']:,}")
+        failed = check_reqs(stats)
 
         if failed:
             return await interaction.followup.send(
-                "❌ Requirements not met:\n- " + "\n- ".join(failed),
+                "\n- ".join(("❌ Requirements not met:", *failed)),
                 ephemeral=True
             )
 
         # 3) Determine mastery → rank
         mastery_count = stats["masteries"]
-        role_name = None
-        for threshold, rank in sorted(rank_thresholds.items(), reverse=True):
-            if mastery_count >= threshold:
-                role_name = rank
-                break
+        idx = bisect.bisect_right(thresholds_asc, mastery_count) - 1
+        role_name = ranks_asc[idx] if idx >= 0 else None
         if not role_name:
-            return await interaction.followup.send(
-                "No rank mapping found for your mastery count.", ephemeral=True
-            )
+            return await interaction.followup.send(_NO_RANK_MSG, ephemeral=True)
 
         # Resolve Discord role (optional in discord-only; used in auto-mc to mirror role)
-        target_role = discord.utils.get(interaction.guild.roles, name=role_name)
+        target_role = role_by_name(interaction.guild, role_name)
 
         # For logs
         gcfg = get_guild_cfg(interaction.guild_id)
-        log_ch = interaction.guild.get_channel(int(gcfg.get("log_channel_id") or 0))
+        log_ch_id = gcfg["log_channel_id"]
+        log_ch = interaction.guild.get_channel(log_ch_id) if log_ch_id else None
 
         # 4) Modes (now from ENV)
         mode = PROMOTION_MODE
 
         if mode == "discord-only":
             # Post approval card in the configured promotion queue channel
-            queue_id = gcfg.get("promotion_channel_id")
+            queue_id = gcfg["promotion_channel_id"]
             if not queue_id:
-                return await interaction.followup.send(
-                    "No promotion queue channel set. Run `/setuppromotions #channel` first.",
-                    ephemeral=True
-                )
-            queue = interaction.guild.get_channel(int(queue_id))
+                return await interaction.followup.send(_NO_QUEUE_MSG, ephemeral=True)
+            queue = interaction.guild.get_channel(queue_id)
             if not isinstance(queue, discord.TextChannel):
-                return await interaction.followup.send("Promotion channel invalid.", ephemeral=True)
+                return await interaction.followup.send(_CHANNEL_INVALID_MSG, ephemeral=True)
 
             who = (member or interaction.user)
-            e = discord.Embed(
-                title="Promotion Request",
-                description=f"IGN: **{username}**\nTarget Rank: **{role_name}**",
-                color=discord.Color.green()
-            )
-            e.add_field(name="Masteries", value=str(mastery_count))
-            e.add_field(name="SB Level", value=str(stats["sb_level"]))
-            e.add_field(name="Skill Avg", value=str(stats["skill_avg"]))
-            e.add_field(name="Cata", value=str(stats["cata_lvl"]))
-            e.add_field(name="Slayer XP", value=f"{stats['slayer_xp']:,}")
-            e.add_field(name="Networth", value=f"{stats['networth']:,}")
-            e.add_field(name="Farm Weight", value=f"{stats['farm_weight']:,}")
-            e.add_field(name="Rift Charms", value="All" if stats["rift_all_charms"] else "Incomplete")
-            e.set_footer(text=f"Requested by {interaction.user}")
+            e = _build_promotion_embed(username, role_name, stats, mastery_count, interaction.user)
 
             # Mention the target Discord member so the Approve handler can grant role
-            view = PersistentPromotionApproveView()  # as required by your view implementation:contentReference[oaicite:1]{index=1}
-            msg = await queue.send(content=who.mention, embed=e, view=view)
+            msg = await queue.send(content=who.mention, embed=e, view=_PERSISTENT_VIEW)
 
             # Log queued request
             if log_ch:
-                await log_ch.send(
+                enqueue_log(
+                    log_ch.id,
                     f"📬 **Promotion Queued** — {who.mention} | IGN **{username}** → **{role_name}** • [Jump]({msg.jump_url})"
                 )
 
-            return await interaction.followup.send("✅ Queued promotion for approval.", ephemeral=True)
+            return await interaction.followup.send(_QUEUED_MSG, ephemeral=True)
 
         elif mode == "auto-mc":
             bridge_url = PROMOTION_BRIDGE_URL
             if not bridge_url:
-                return await interaction.followup.send(
-                    "⚠ `PROMOTION_BRIDGE_URL` not set in environment.",
-                    ephemeral=True
-                )
+                return await interaction.followup.send(_BRIDGE_NOT_SET_MSG, ephemeral=True)
 
             # Default target Discord member (for mirroring role)
             target_member = member or interaction.guild.get_member(interaction.user.id)
 
             # Bridge payload
             payload = {
-                "action": "promote",
+                **_BRIDGE_PAYLOAD_BASE,
                 "ign": username,
                 "target_rank": role_name,
                 "requested_by_discord_id": str(interaction.user.id),
@@ -143,34 +156,29 @@ async def setup(client: discord.Client):
                 "guild_id": str(interaction.guild_id)
             }
 
-            headers = {}
-            if PROMOTION_BRIDGE_TOKEN:
-                headers["Authorization"] = f"Bearer {PROMOTION_BRIDGE_TOKEN}"
-
             ok = False
             body = ""
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(bridge_url, json=payload, headers=headers, timeout=15) as resp:
+                session = await get_session()
+                async with asyncio.timeout(BRIDGE_TIMEOUT):
+                    async with session.post(bridge_url, data=orjson.dumps(payload), headers=_BRIDGE_HEADERS) as resp:
                         body = await resp.text()
                         ok = (200 <= resp.status < 300)
+            except TimeoutError:
+                body = "timeout"
             except Exception as e:
                 body = f"{e}"
 
             # Log outcome to log channel
             if log_ch:
-                if ok:
-                    await log_ch.send(
-                        f"🤖 **Auto-MC Promote** — IGN **{username}** → **{role_name}** • "
-                        f"requested by {interaction.user.mention}\n"
-                        f"Bridge response: `{(body[:1800] + '…') if len(body) > 1800 else body}`"
-                    )
-                else:
-                    await log_ch.send(
-                        f"⚠ **Auto-MC Promote FAILED** — IGN **{username}** → **{role_name}** • "
-                        f"requested by {interaction.user.mention}\n"
-                        f"Bridge response: `{(body[:1800] + '…') if len(body) > 1800 else body}`"
-                    )
+                title = "🤖 **Auto-MC Promote**" if ok else "⚠ **Auto-MC Promote FAILED**"
+                shown = body if len(body) <= 1800 else body[:1800] + "…"
+                enqueue_log(
+                    log_ch.id,
+                    f"{title} — IGN **{username}** → **{role_name}** • "
+                    f"requested by {interaction.user.mention}\n"
+                    f"Bridge response: `{shown}`"
+                )
 
             if not ok:
                 return await interaction.followup.send(
@@ -178,25 +186,29 @@ async def setup(client: discord.Client):
                     ephemeral=True
                 )
 
-            # Mirror the Discord role locally (optional)
+            # Mirror the Discord role locally (optional) while the followup goes out
+            role_task = None
             if target_role and target_member:
+                role_task = asyncio.create_task(
+                    target_member.add_roles(target_role, reason=f"Auto-MC promote to {role_name}")
+                )
+
+            await interaction.followup.send(
+                f"✅ Auto-promoted **{username}** in Hypixel (target rank: **{role_name}**).",
+                ephemeral=False
+            )
+
+            if role_task:
                 try:
-                    await target_member.add_roles(target_role, reason=f"Auto-MC promote to {role_name}")
+                    await role_task
                 except discord.Forbidden:
                     if log_ch:
-                        await log_ch.send(
+                        enqueue_log(
+                            log_ch.id,
                             f"⚠ Could not assign Discord role **{role_name}** to {target_member.mention} "
                             f"(insufficient permissions)."
                         )
-
-            await interaction.followup.send(
-                f"✅ Auto-promoted **{username}** in Hypixel (target rank: **{role_name}**).",
-                ephemeral=False
-            )
             return
 
         else:
-            return await interaction.followup.send(
-                f"Unknown promotion mode in env: `{mode}`. Use `discord-only` or `auto-mc`.",
-                ephemeral=True
-            )
+            return await interaction.followup.send(_UNKNOWN_MODE_MSG, ephemeral=True)
@@ -2,10 +2,13 @@
 import os, discord
 from discord import app_commands
 from utils.config import get_guild_cfg, set_guild_cfg
-from utils.hypixel_api import username_to_uuid, hypixel_guild_by_player
+from utils.hypixel_api import username_to_uuid
+from utils.hypixel_cache import cached_hypixel_guild_by_player
+from utils.fuzzy import suggest
 
 # Hypixel rank names you commonly see in guilds. You can extend this list.
 KNOWN_GUILD_RANKS = ["Guild Master", "Admin", "Masters", "Dominus", "Legatus", "Primus"]
+_KNOWN_UP = [(r.upper(), r) for r in KNOWN_GUILD_RANKS]  # uppercased once for autocomplete
 
 async def setup(client: discord.Client):
     tree = client.tree
@@ -13,26 +16,30 @@ async def setup(client: discord.Client):
     # ===== User command: /ranksync =====
     @tree.command(name="ranksync", description="Sync your Hypixel Guild rank to the mapped Discord role")
     async def ranksync(interaction: discord.Interaction, minecraft_username: str):
-        await interaction.response.defer(ephemeral=True, thinking=True)
+        # Cheap checks answer immediately; defer only before network I/O
         api_key = os.getenv("HYPIXEL_API_KEY")
         if not api_key:
-            return await interaction.followup.send("Configuration error: HYPIXEL_API_KEY missing.", ephemeral=True)
+            return await interaction.response.send_message("Configuration error: HYPIXEL_API_KEY missing.", ephemeral=True)
         if not interaction.guild:
-            return await interaction.followup.send("Run this command in a server.", ephemeral=True)
+            return await interaction.response.send_message("Run this command in a server.", ephemeral=True)
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
 
         # 1) username -> uuid
-        uuid = await username_to_uuid(minecraft_username)
+        try:
+            uuid = await username_to_uuid(minecraft_username)
+        except Exception as e:
+            return await interaction.followup.send(f"Error talking to Mojang: {e}", ephemeral=True)
         if not uuid:
             return await interaction.followup.send(f"I couldn't find **{minecraft_username}** on Mojang.", ephemeral=True)
 
         # 2) guild lookup by player
-        guild = await hypixel_guild_by_player(uuid, api_key)
+        guild = await cached_hypixel_guild_by_player(uuid, api_key)
         if not guild:
             return await interaction.followup.send("You are not in a Hypixel Guild.", ephemeral=True)
 
         # 3) find member entry for this uuid
-        members = guild.get("members") or []
-        me = next((m for m in members if (m.get("uuid") or "").replace("-", "") == uuid), None)
+        me = guild["_uuid_index"].get(uuid)
         if not me:
             return await interaction.followup.send("Could not locate you in the guild member list.", ephemeral=True)
 
@@ -42,27 +49,28 @@ async def setup(client: discord.Client):
 
         # 4) map to Discord role via config
         cfg = get_guild_cfg(interaction.guild_id)
-        mapping: dict = cfg.get("rank_role_map") or {}
+        mapping: dict = cfg["rank_role_map_norm"]
         role_id = mapping.get(hyp_rank)
         if not role_id:
             # Suggest the closest configured ranks
-            available = ", ".join(sorted(mapping.keys())) or "none configured"
+            available = ", ".join(suggest(hyp_rank, mapping.keys())) or "none configured"
             return await interaction.followup.send(
                 f"No role is mapped for your guild rank **{hyp_rank}**.\n"
                 f"Ask an admin to map it with `/ranksync_map`.\n"
-                f"Currently configured: {available}.",
+                f"Closest configured: {available}.",
                 ephemeral=True
             )
 
-        role = interaction.guild.get_role(int(role_id))
+        role = interaction.guild.get_role(role_id)
         if not role:
             return await interaction.followup.send("The mapped Discord role no longer exists. Ask an admin to remap.", ephemeral=True)
 
         # 5) apply role (and optionally remove other mapped roles)
         # ensure bot can manage the role
-        if not interaction.guild.me.guild_permissions.manage_roles:  # type: ignore
+        me_bot = interaction.guild.me
+        if not me_bot.guild_permissions.manage_roles:  # type: ignore
             return await interaction.followup.send("I need **Manage Roles** permission.", ephemeral=True)
-        if role >= interaction.guild.me.top_role:  # type: ignore
+        if role >= me_bot.top_role:  # type: ignore
             return await interaction.followup.send("The target role is higher than my top role. Adjust role hierarchy.", ephemeral=True)
 
         member = interaction.guild.get_member(interaction.user.id)
@@ -70,14 +78,17 @@ async def setup(client: discord.Client):
             return await interaction.followup.send("Could not fetch your member object.", ephemeral=True)
 
         # Remove any other roles that are part of the mapping to keep things clean
-        mapped_role_ids = set(int(v) for v in mapping.values() if v)
-        roles_to_remove = [r for r in member.roles if r.id in mapped_role_ids and r.id != int(role_id)]
+        remove_ids = cfg["mapped_role_ids"] - {role_id}
+        roles_to_remove = [r for r in member.roles if r.id in remove_ids]
 
+        # One PATCH for both the cleanup and the new role
+        needs_add = member.get_role(role.id) is None
         try:
-            if roles_to_remove:
-                await member.remove_roles(*roles_to_remove, reason="RankSync cleanup")
-            if role not in member.roles:
-                await member.add_roles(role, reason=f"RankSync: {hyp_rank}")
+            if roles_to_remove or needs_add:
+                final = [r for r in member.roles if not r.is_default() and r.id not in remove_ids]
+                if needs_add:
+                    final.append(role)
+                await member.edit(roles=final, reason=f"RankSync: {hyp_rank}")
         except discord.Forbidden:
             return await interaction.followup.send("I don't have permission to edit your roles.", ephemeral=True)
 
@@ -109,20 +120,25 @@ async def setup(client: discord.Client):
     @ranksync_map.autocomplete("hypixel_guild_rank")  # type: ignore
     async def ac_rank(interaction: discord.Interaction, current: str):
         current_up = (current or "").upper()
-        choices = [app_commands.Choice(name=r, value=r) for r in KNOWN_GUILD_RANKS if current_up in r]
-        return choices[:25]
+        if not current_up:
+            names = KNOWN_GUILD_RANKS
+        else:
+            # substring hits first, then fuzzy matches for typos
+            names = [r for up, r in _KNOWN_UP if current_up in up]
+            names += [r for r in suggest(current_up, KNOWN_GUILD_RANKS, limit=25, score_cutoff=0.7) if r not in names]
+        return [app_commands.Choice(name=r, value=r) for r in names[:25]]
 
     # ===== Admin: show / clear mappings =====
     @tree.command(name="ranksync_show", description="Show current guild rank → role mappings")
     @app_commands.checks.has_permissions(manage_roles=True)
     async def ranksync_show(interaction: discord.Interaction):
         cfg = get_guild_cfg(interaction.guild_id)
-        mapping: dict = cfg.get("rank_role_map") or {}
+        mapping: dict = cfg["rank_role_map_norm"]
         if not mapping:
             return await interaction.response.send_message("No mappings configured.", ephemeral=True)
         lines = []
         for k, v in sorted(mapping.items()):
-            role = interaction.guild.get_role(int(v))
+            role = interaction.guild.get_role(v)
             lines.append(f"**{k}** → {role.mention if role else f'`{v}` (missing)'}")
         await interaction.response.send_message("\n".join(lines), ephemeral=True)
 
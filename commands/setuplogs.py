@@ -4,6 +4,9 @@ from discord import app_commands
 from utils.config import set_guild_cfg, get_guild_cfg
 from utils.checks import is_guild_admin
 
+_LOGS_SET_EMBED = discord.Embed(title="Logs channel set", color=discord.Color.blurple())
+_LOGS_SET_EMBED.set_footer(text="You can change this anytime with /setuplogs")
+
 async def setup(client: discord.Client):
     tree = client.tree
 
@@ -21,12 +24,8 @@ async def setup(client: discord.Client):
         set_guild_cfg(interaction.guild_id, log_channel_id=channel.id)
 
         # Quick confirm embed
-        embed = discord.Embed(
-            title="Logs channel set",
-            description=f"Audit logs will be posted in {channel.mention}.",
-            color=discord.Color.blurple()
-        )
-        embed.set_footer(text="You can change this anytime with /setuplogs")
+        embed = _LOGS_SET_EMBED.copy()
+        embed.description = f"Audit logs will be posted in {channel.mention}."
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
     @tree.command(
@@ -43,7 +42,7 @@ async def setup(client: discord.Client):
                 "No logs channel configured. Run `/setuplogs` first.", ephemeral=True
             )
 
-        ch = interaction.guild.get_channel(int(log_id)) if interaction.guild else None
+        ch = interaction.guild.get_channel(log_id) if interaction.guild else None
         if not isinstance(ch, (discord.TextChannel, discord.Thread, discord.ForumChannel)):
             return await interaction.response.send_message(
                 "Configured logs channel is invalid or missing. Run `/setuplogs` again.",
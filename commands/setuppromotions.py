@@ -30,7 +30,8 @@ async def setup(client: discord.Client):
     @is_guild_admin()
     async def promotionchannel(interaction: discord.Interaction):
         cfg = get_guild_cfg(interaction.guild_id)
-        ch = interaction.guild.get_channel(int(cfg.get("promotion_channel_id", 0)))
+        ch_id = cfg["promotion_channel_id"]
+        ch = interaction.guild.get_channel(ch_id) if ch_id else None
         if ch:
             await interaction.response.send_message(
                 f"📌 Current promotion channel: {ch.mention}", ephemeral=True
@@ -7,6 +7,25 @@ from utils.config import set_guild_cfg, get_guild_cfg
 from views.verification_view import VerifyView
 from utils.checks import is_guild_admin
 
+DEFAULT_TITLE = "Verification required"
+DEFAULT_DESC = (
+    "Click the button below to verify your Minecraft username "
+    "with your Hypixel-linked Discord."
+)
+
+_DEFAULT_EMBED = discord.Embed(title=DEFAULT_TITLE, description=DEFAULT_DESC, color=discord.Color.blurple())
+_DEFAULT_EMBED.set_footer(text="Hypixel verification")
+
+def _verification_embed(title: str, description: str) -> discord.Embed:
+    if title == DEFAULT_TITLE and description == DEFAULT_DESC:
+        return _DEFAULT_EMBED.copy()
+    embed = discord.Embed(title=title, description=description, color=discord.Color.blurple())
+    embed.set_footer(text="Hypixel verification")
+    return embed
+
+# VerifyView is stateless (the button opens a fresh modal), so one instance is shared
+_VERIFY_VIEW = VerifyView()
+
 async def setup(client: discord.Client):
     tree = client.tree
 
@@ -17,25 +36,16 @@ async def setup(client: discord.Client):
         interaction: discord.Interaction,
         channel: discord.TextChannel,
         verified_role: discord.Role | None = None,
-        title: str = "Verification required",
-        description: str = (
-            "Click the button below to verify your Minecraft username "
-            "with your Hypixel-linked Discord."
-        )
+        title: str = DEFAULT_TITLE,
+        description: str = DEFAULT_DESC
     ):
         set_guild_cfg(
             interaction.guild_id,
             channel_id=channel.id,
             role_id=(verified_role.id if verified_role else None)
         )
-        embed = discord.Embed(
-            title=title,
-            description=description,
-            color=discord.Color.blurple()
-        )
-        embed.set_footer(text="Hypixel verification")
-        view = VerifyView()
-        msg = await channel.send(embed=embed, view=view)
+        embed = _verification_embed(title, description)
+        msg = await channel.send(embed=embed, view=_VERIFY_VIEW)
         await interaction.response.send_message(
             f"✅ Verification message posted in {channel.mention} (message ID: {msg.id}).",
             ephemeral=True
@@ -46,11 +56,8 @@ async def setup(client: discord.Client):
     @is_guild_admin()
     async def verification_reset(
         interaction: discord.Interaction,
-        title: str = "Verification required",
-        description: str = (
-            "Click the button below to verify your Minecraft username "
-            "with your Hypixel-linked Discord."
-        )
+        title: str = DEFAULT_TITLE,
+        description: str = DEFAULT_DESC
     ):
         cfg = get_guild_cfg(interaction.guild_id)
         channel_id = cfg.get("channel_id")
@@ -60,21 +67,15 @@ async def setup(client: discord.Client):
                 ephemeral=True
             )
 
-        channel = interaction.guild.get_channel(int(channel_id)) if interaction.guild else None
+        channel = interaction.guild.get_channel(channel_id) if interaction.guild else None
         if not isinstance(channel, discord.TextChannel):
             return await interaction.response.send_message(
                 "Configured channel is invalid or not found. Re-run `/verification_setup`.",
                 ephemeral=True
             )
 
-        embed = discord.Embed(
-            title=title,
-            description=description,
-            color=discord.Color.blurple()
-        )
-        embed.set_footer(text="Hypixel verification")
-        view = VerifyView()
-        msg = await channel.send(embed=embed, view=view)
+        embed = _verification_embed(title, description)
+        msg = await channel.send(embed=embed, view=_VERIFY_VIEW)
         await interaction.response.send_message(
             f"🔁 Verification message re-posted in {channel.mention} (message ID: {msg.id}).",
             ephemeral=True
@@ -98,9 +99,9 @@ async def setup(client: discord.Client):
             set_guild_cfg(interaction.guild_id, **updates)
 
         cfg = get_guild_cfg(interaction.guild_id)
-        ch = interaction.guild.get_channel(int(cfg["channel_id"])) if cfg["channel_id"] else None
-        log = interaction.guild.get_channel(int(cfg["log_channel_id"])) if cfg["log_channel_id"] else None
-        role = interaction.guild.get_role(int(cfg["role_id"])) if cfg["role_id"] else None
+        ch = interaction.guild.get_channel(cfg["channel_id"]) if cfg["channel_id"] else None
+        log = interaction.guild.get_channel(cfg["log_channel_id"]) if cfg["log_channel_id"] else None
+        role = interaction.guild.get_role(cfg["role_id"]) if cfg["role_id"] else None
 
         embed = discord.Embed(title="Verification Settings", color=discord.Color.blurple())
         embed.add_field(name="Verification Channel", value=(ch.mention if ch else "Not set"), inline=False)
@@ -0,0 +1,27 @@
+# events/on_guild_roles.py
+import discord
+from utils.guild_cache import invalidate_roles
+from utils.checks import invalidate_admin_cache
+
+async def setup(client: discord.Client):
+    # Role name index is rebuilt on next lookup
+    @client.event
+    async def on_guild_role_create(role: discord.Role):
+        invalidate_roles(role.guild.id)
+
+    @client.event
+    async def on_guild_role_update(before: discord.Role, after: discord.Role):
+        invalidate_roles(after.guild.id)
+        if before.permissions != after.permissions:
+            invalidate_admin_cache(after.guild.id)
+
+    @client.event
+    async def on_guild_role_delete(role: discord.Role):
+        invalidate_roles(role.guild.id)
+        invalidate_admin_cache(role.guild.id)
+
+    # Admin checks depend on a member's roles
+    @client.event
+    async def on_member_update(before: discord.Member, after: discord.Member):
+        if before.roles != after.roles:
+            invalidate_admin_cache(after.guild.id, after.id)
@@ -1,11 +1,71 @@
 # events/on_member_join.py
+import time
+import asyncio
+import logging
 import discord
 
+logger = logging.getLogger("discord")
+
+WELCOME_DM = "Welcome! Please verify by clicking the **Verify me** button in the server."
+DM_INTERVAL = 1.2        # long-run seconds per welcome DM (token refill rate)
+DM_BURST = 3             # DMs that may go out back-to-back after an idle period
+DM_BACKOFF_40003 = 10.0  # extra delay after "opening DMs too fast" (error 40003)
+DM_WORKERS = 1           # consumers of _DM_QUEUE; pacing is shared via the slot reservation
+
+# Token bucket: refills at 1/DM_INTERVAL per second up to DM_BURST; may go negative (reserved debt)
+_DM_LOCK = asyncio.Lock()
+_tokens = float(DM_BURST)
+_last_refill = 0.0
+
+# Joins are enqueued and DM'd by background workers, so join bursts don't pile up handler tasks
+_DM_QUEUE: asyncio.Queue[discord.Member] = asyncio.Queue()
+_WORKERS: list[asyncio.Task] = []
+
+async def _reserve_slot(extra: float = 0.0) -> float:
+    """Take a token (plus `extra` seconds' worth); returns how long to wait for it. Lock held only for the update."""
+    global _tokens, _last_refill
+    async with _DM_LOCK:
+        now = time.monotonic()
+        _tokens = min(DM_BURST, _tokens + (now - _last_refill) / DM_INTERVAL)
+        _last_refill = now
+        _tokens -= 1 + extra / DM_INTERVAL
+        return -_tokens * DM_INTERVAL if _tokens < 0 else 0.0
+
+async def _safe_dm(member: discord.Member, content: str):
+    """DM a member at the paced rate; ignore closed DMs, back off once on 40003."""
+    for attempt in range(2):
+        wait = await _reserve_slot(DM_BACKOFF_40003 if attempt else 0.0)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        try:
+            await member.send(content)
+            return
+        except discord.HTTPException as e:
+            if e.code != 40003:
+                return  # DMs closed or other failure
+
+async def _dm_worker():
+    while True:
+        member = await _DM_QUEUE.get()
+        try:
+            await _safe_dm(member, WELCOME_DM)
+        except Exception:
+            # e.g. a network error from member.send; the worker must keep serving the queue
+            logger.exception("Welcome DM to %s failed", member.id)
+        finally:
+            _DM_QUEUE.task_done()
+
+def stop_dm_workers():
+    """Cancel the welcome-DM workers (called from Client.close)."""
+    for task in _WORKERS:
+        task.cancel()
+    _WORKERS.clear()
+
 async def setup(client: discord.Client):
+    if not _WORKERS:
+        _WORKERS.extend(asyncio.create_task(_dm_worker()) for _ in range(DM_WORKERS))
+
     @client.event
     async def on_member_join(member: discord.Member):
         # Optional example: DM newcomers. Ignore failures when DMs are closed.
-        try:
-            await member.send("Welcome! Please verify by clicking the **Verify me** button in the server.")
-        except discord.Forbidden:
-            pass
+        _DM_QUEUE.put_nowait(member)
@@ -1,8 +1,11 @@
 # events/on_ready.py
 import discord
+from utils.guild_cache import index_roles
 
 async def setup(client: discord.Client):
     @client.event
     async def on_ready():
         # Keep this lightweight; heavy work should go in setup_hook.
+        for guild in client.guilds:
+            index_roles(guild)
         print(f"✅logged in as {client.user} (ID: {client.user.id})")
@@ -1,12 +1,15 @@
 # ===== Imports =====
 import os
+import asyncio
 import logging
 import importlib
-import inspect
 import discord
 from dotenv import load_dotenv
 from discord import app_commands
 from utils.checks import ADMIN_ROLE_IDS
+from utils.http import close_session
+from utils.log_queue import start_log_flusher, stop_log_flusher
+from events.on_members_join import stop_dm_workers
 
 # ===== .env =====
 load_dotenv()
@@ -34,27 +37,37 @@ class Client(discord.Client):
         self.tree = app_commands.CommandTree(self)
 
     async def setup_hook(self):
-        # 1) Auto-load persistent views
+        # 0) Background log-channel writer
+        start_log_flusher(self)
+
+        # 1) Auto-load persistent views (each views module lists them in PERSISTENT_VIEWS)
         for fname in os.listdir("./views"):
             if fname.endswith(".py") and not fname.startswith("__"):
                 modname = f"views.{fname[:-3]}"
                 module = importlib.import_module(modname)
-                for _, obj in inspect.getmembers(module, inspect.isclass):
-                    if issubclass(obj, discord.ui.View) and obj is not discord.ui.View:
-                        try:
-                            self.add_view(obj())
-                            print(f"✅ Loaded view: {obj.__name__}")
-                        except Exception as e:
-                            print(f"⚠ Failed to load view {obj.__name__}: {e}")
-
-        # 2) Load commands and events
+                for view_cls in getattr(module, "PERSISTENT_VIEWS", ()):
+                    try:
+                        self.add_view(view_cls())
+                        print(f"✅ Loaded view: {view_cls.__name__}")
+                    except Exception as e:
+                        print(f"⚠ Failed to load view {view_cls.__name__}: {e}")
+
+        # 2) Load commands and events (setups run concurrently)
+        modules = []
         for pkg in ("commands", "events"):
             for fname in os.listdir(f"./{pkg}"):
                 if fname.endswith(".py") and not fname.startswith("__"):
                     modname = f"{pkg}.{fname[:-3]}"
                     module = importlib.import_module(modname)
                     if hasattr(module, "setup"):
-                        await module.setup(self)
+                        modules.append((modname, module))
+        results = await asyncio.gather(*(m.setup(self) for _, m in modules), return_exceptions=True)
+        failed = [(modname, r) for (modname, _), r in zip(modules, results) if isinstance(r, BaseException)]
+        for modname, result in failed:
+            print(f"⚠ Failed to set up {modname}: {result!r}")
+        if failed:
+            # Don't sync a partial tree: that would delete the broken module's commands everywhere
+            raise failed[0][1]
 
         # 3) Sync commands globally
         synced = await self.tree.sync()
@@ -71,22 +84,33 @@ class Client(discord.Client):
             "logtest",
             "sync"
         }
+        sem = asyncio.Semaphore(5)  # stay well inside Discord's rate limits
+
+        async def set_perms(guild, cmd, perms):
+            async with sem:
+                try:
+                    await self.tree.set_command_permissions(guild.id, cmd.id, perms)
+                    print(f"✅ Set permissions for '{cmd.name}' in {guild.name}")
+                except Exception as e:
+                    print(f"⚠ Could not set permissions for '{cmd.name}' in {guild.name}: {e}")
+
+        jobs = []
         for guild in self.guilds:
-            for cmd in synced:
-                if cmd.name in admin_only_cmds:
-                    perms = []
-                    for rid in ADMIN_ROLE_IDS:
-                        perms.append(app_commands.CommandPermission(
-                            id=rid, type=1, permission=True
-                        ))
-                    perms.append(app_commands.CommandPermission(
-                        id=guild.default_role.id, type=1, permission=False
-                    ))
-                    try:
-                        await self.tree.set_command_permissions(guild.id, cmd.id, perms)
-                        print(f"✅ Set permissions for '{cmd.name}' in {guild.name}")
-                    except Exception as e:
-                        print(f"⚠ Could not set permissions for '{cmd.name}' in {guild.name}: {e}")
+            perms = [
+                app_commands.CommandPermission(id=rid, type=1, permission=True)
+                for rid in ADMIN_ROLE_IDS
+            ]
+            perms.append(app_commands.CommandPermission(
+                id=guild.default_role.id, type=1, permission=False
+            ))
+            jobs.extend(set_perms(guild, cmd, perms) for cmd in synced if cmd.name in admin_only_cmds)
+        await asyncio.gather(*jobs)
+
+    async def close(self):
+        await stop_log_flusher()  # drain queued audit lines while the HTTP client is still open
+        stop_dm_workers()
+        await close_session()
+        await super().close()
 
     async def on_ready(self):
         print(f"Logged on as {self.user}! (ID: {self.user.id})")
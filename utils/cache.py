@@ -0,0 +1,43 @@
+# utils/cache.py
+# In-memory async TTL cache shared by the API wrappers (Hypixel, Mojang, linked-tag lookups).
+import time
+import asyncio
+
+
+class AsyncTTLCache:
+    """
+    key -> value cache with a TTL (``negative_ttl`` for None results). Concurrent
+    misses for the same key share one in-flight fetch; failures are not cached.
+    """
+    def __init__(self, ttl: float, maxsize: int = 1024, negative_ttl: float | None = None, ttl_for=None):
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.ttl_for = ttl_for  # optional value -> ttl override
+        self.maxsize = maxsize
+        self._data: dict[str, tuple[float, object]] = {}  # key -> (expires_at, value)
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def get(self, key: str, fetch):
+        hit = self._data.get(key)
+        if hit and time.monotonic() < hit[0]:
+            return hit[1]
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._store(key, t))
+        return await asyncio.shield(task)
+
+    def _store(self, key: str, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        value = task.result()
+        if self.ttl_for is not None:
+            ttl = self.ttl_for(value)
+        else:
+            ttl = self.ttl if value is not None else self.negative_ttl
+        self._data.pop(key, None)
+        self._data[key] = (time.monotonic() + ttl, value)
+        if len(self._data) > self.maxsize:
+            self._data.pop(next(iter(self._data)))
@@ -1,24 +1,57 @@
 # utils/checks.py
 import os
-from typing import Set
-from discord import app_commands, Interaction
+import time
+from collections import OrderedDict
+from typing import FrozenSet
+from discord import app_commands, Interaction, Member
 
-def _parse_ids(env_val: str | None) -> Set[int]:
+def _parse_ids(env_val: str | None) -> FrozenSet[int]:
     if not env_val:
-        return set()
-    return {int(x) for x in env_val.split(",") if x.strip().isdigit()}
+        return frozenset()
+    return frozenset(int(x) for x in env_val.split(",") if x.strip().isdigit())
 
-ADMIN_ROLE_IDS = _parse_ids(os.getenv("ADMIN_ROLE_IDS"))
+# Parsed once per process; shared by every command module via is_guild_admin()
+ADMIN_ROLE_IDS: FrozenSet[int] = _parse_ids(os.getenv("ADMIN_ROLE_IDS"))
+
+ADMIN_CACHE_TTL = 30      # seconds an admin-check result is reused
+ADMIN_CACHE_MAX = 1024
+
+# (guild_id, user_id) -> (expires_at, is_admin); dropped on member/role updates
+_ADMIN_CACHE: OrderedDict[tuple[int, int], tuple[float, bool]] = OrderedDict()
+
+def invalidate_admin_cache(guild_id: int, user_id: int | None = None):
+    """Forget cached admin checks for one member, or the whole guild if user_id is None."""
+    if user_id is not None:
+        _ADMIN_CACHE.pop((guild_id, user_id), None)
+        return
+    for key in [k for k in _ADMIN_CACHE if k[0] == guild_id]:
+        del _ADMIN_CACHE[key]
+
+def _is_admin(member: Member) -> bool:
+    if ADMIN_ROLE_IDS and any(r.id in ADMIN_ROLE_IDS for r in member.roles):
+        return True
+    return member.guild_permissions.administrator
 
 def is_guild_admin():
     """Check: user must have ADMIN_ROLE_IDS role OR Administrator perm."""
     async def predicate(interaction: Interaction) -> bool:
         if not interaction.guild or not interaction.user:
             return False
-        member = interaction.guild.get_member(interaction.user.id)
-        if not member:
-            return False
-        if ADMIN_ROLE_IDS and any(r.id in ADMIN_ROLE_IDS for r in member.roles):
-            return True
-        return member.guild_permissions.administrator
+        key = (interaction.guild.id, interaction.user.id)
+        now = time.monotonic()
+        hit = _ADMIN_CACHE.get(key)
+        if hit and now < hit[0]:
+            return hit[1]
+
+        member = interaction.user
+        if not isinstance(member, Member):
+            member = interaction.guild.get_member(interaction.user.id)
+            if not member:
+                return False
+        result = _is_admin(member)
+        _ADMIN_CACHE[key] = (now + ADMIN_CACHE_TTL, result)
+        _ADMIN_CACHE.move_to_end(key)
+        if len(_ADMIN_CACHE) > ADMIN_CACHE_MAX:
+            _ADMIN_CACHE.popitem(last=False)
+        return result
     return app_commands.check(predicate)
@@ -1,60 +1,137 @@
 # utils/config.py
-import json, discord
+import json, asyncio, discord
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 
-CONFIG_PATH = Path("guild_config.json")
+CONFIG_PATH = Path("guild_config.json")  # legacy single-file config, read-only fallback
+CONFIG_DIR = Path("guild_config")         # one <guild_id>.json per guild; writes go here
 DEFAULTS = {
     "channel_id": None,         # verification embed channel
     "role_id": None,            # verified role
     "log_channel_id": None,     # audit logs
+    "promotion_channel_id": None,  # promotion approval queue
     "cooldown_seconds": 60,     # verification attempt cooldown
     "rank_role_map": {},        # {"GUILDMASTER": 1234567890, "OFFICER": 2345, "MEMBER": 3456}
 }
+ID_KEYS = ("channel_id", "role_id", "log_channel_id", "promotion_channel_id")
 
-def _read() -> Dict[str, Any]:
-    if CONFIG_PATH.exists():
-        return json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
-    return {}
+# Legacy file, reloaded only when its mtime changes (external edits)
+_LEGACY: Dict[str, Any] | None = None
+_LEGACY_MTIME: int = 0
 
-def _write(data: Dict[str, Any]):
-    CONFIG_PATH.write_text(json.dumps(data, indent=2), encoding="utf-8")
+# guild_id -> (source stamp, merged cfg with ID_KEYS already coerced to int | None)
+_GUILD_CACHE: Dict[int, tuple[tuple[int, int], Dict[str, Any]]] = {}
 
-def load_cfg() -> Dict[str, Any]:
-    return _read()
+def _mtime(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
 
-def save_cfg(cfg: Dict[str, Any]):
-    _write(cfg)
+def _guild_path(guild_id: int) -> Path:
+    return CONFIG_DIR / f"{guild_id}.json"
 
-def get_guild_cfg(guild_id: int) -> Dict[str, Any]:
-    data = _read()
-    g = data.get(str(guild_id), {})
+def _read_legacy() -> Dict[str, Any]:
+    global _LEGACY, _LEGACY_MTIME
+    mtime = _mtime(CONFIG_PATH)
+    if _LEGACY is None or mtime != _LEGACY_MTIME:
+        _LEGACY = json.loads(CONFIG_PATH.read_text(encoding="utf-8")) if mtime else {}
+        _LEGACY_MTIME = mtime
+    return _LEGACY
+
+def _stamp(guild_id: int) -> tuple[int, int]:
+    """(own file mtime, legacy file mtime); the legacy file only matters while the guild has no own file."""
+    own = _mtime(_guild_path(guild_id))
+    return (own, 0) if own else (0, _mtime(CONFIG_PATH))
+
+def _read_guild(guild_id: int, stamp: tuple[int, int]) -> Dict[str, Any]:
+    if stamp[0]:
+        return json.loads(_guild_path(guild_id).read_text(encoding="utf-8"))
+    return _read_legacy().get(str(guild_id), {})
+
+def _write_guild(guild_id: int, raw: Dict[str, Any]) -> int:
+    CONFIG_DIR.mkdir(exist_ok=True)
+    path = _guild_path(guild_id)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(raw, indent=2), encoding="utf-8")
+    tmp.replace(path)  # atomic: readers never see a half-written file
+    return path.stat().st_mtime_ns
+
+def _cache_guild(guild_id: int, stamp: tuple[int, int], raw: Dict[str, Any]) -> Dict[str, Any]:
+    g = dict(raw)
     for k, v in DEFAULTS.items():
         g.setdefault(k, v)
+    for k in ID_KEYS:
+        g[k] = int(g[k]) if g[k] else None
+    # derived, cache-only: rank map with normalized keys / int ids, and the set of mapped ids
+    g["rank_role_map_norm"] = {k.strip().upper(): int(v) for k, v in g["rank_role_map"].items() if v}
+    g["mapped_role_ids"] = frozenset(g["rank_role_map_norm"].values())
+    _GUILD_CACHE[guild_id] = (stamp, g)
     return g
 
+def _copy_cfg(g: Dict[str, Any]) -> Dict[str, Any]:
+    # The rank maps are the only mutable nested values; copy them so callers can't edit the cache
+    out = dict(g)
+    out["rank_role_map"] = dict(g["rank_role_map"])
+    out["rank_role_map_norm"] = dict(g["rank_role_map_norm"])
+    return out
+
+def get_guild_cfg(guild_id: int) -> Dict[str, Any]:
+    """Merged-defaults config for a guild (a copy, rank maps included; safe to modify)."""
+    stamp = _stamp(guild_id)  # cheap stat; external edits reload
+    hit = _GUILD_CACHE.get(guild_id)
+    if hit is not None and hit[0] == stamp:
+        return _copy_cfg(hit[1])
+    return _copy_cfg(_cache_guild(guild_id, stamp, _read_guild(guild_id, stamp)))
+
+def _normalize_updates(updates: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce ids to int before they are persisted (bad values fail here, not mid-command)."""
+    for k in ID_KEYS:
+        if k in updates:
+            updates[k] = int(updates[k]) if updates[k] else None
+    if "rank_role_map" in updates:
+        updates["rank_role_map"] = {k: int(v) for k, v in (updates["rank_role_map"] or {}).items() if v}
+    return updates
+
 def set_guild_cfg(guild_id: int, **updates):
-    data = _read()
-    g = data.get(str(guild_id), {})
+    _normalize_updates(updates)
+    g = dict(_read_guild(guild_id, _stamp(guild_id)))
     g.update(updates)
     for k, v in DEFAULTS.items():
         g.setdefault(k, v)
-    data[str(guild_id)] = g
-    _write(data)
+    mtime = _write_guild(guild_id, g)  # only this guild's file is rewritten
+    _cache_guild(guild_id, (mtime, 0), g)  # write-through: next read is a stat + dict lookup
+
+async def aget_guild_cfg(guild_id: int) -> Dict[str, Any]:
+    """get_guild_cfg for async handlers; the stat/parse runs in a worker thread."""
+    return await asyncio.to_thread(get_guild_cfg, guild_id)
+
+async def aset_guild_cfg(guild_id: int, **updates):
+    """set_guild_cfg for async handlers; the file write runs in a worker thread."""
+    await asyncio.to_thread(set_guild_cfg, guild_id, **updates)
 
 def norm(s: str | None) -> str:
     return (s or "").strip().casefold()
 
-def candidate_discord_names(member: discord.Member) -> list[str]:
-    parts: list[str] = []
-    uname = getattr(member, "name", None)
-    gname = getattr(member, "global_name", None)
-    dname = getattr(member, "display_name", None)
-    disc = getattr(member, "discriminator", None)
-    if uname: parts.append(uname)
-    if gname: parts.append(gname)
-    if dname: parts.append(dname)
+@lru_cache(maxsize=4096)
+def _candidate_names(uname: str | None, gname: str | None, dname: str | None, disc: str | None) -> frozenset[str]:
+    out: set[str] = set()
+    for x in (uname, gname, dname):
+        if x:
+            out.add(norm(x))
+            out.add(norm("@" + x))
     if uname and disc and disc != "0":
-        parts.append(f"{uname}#{disc}")
-    parts += [f"@{x}" for x in list({p for p in parts})]
-    return list({ norm(p) for p in parts if p })
+        tag = f"{uname}#{disc}"
+        out.add(norm(tag))
+        out.add(norm("@" + tag))
+    return frozenset(out)
+
+def candidate_discord_names(member: discord.Member) -> frozenset[str]:
+    """Normalized names a linked Hypixel tag may match; memoized on the member's current names."""
+    return _candidate_names(
+        getattr(member, "name", None),
+        getattr(member, "global_name", None),
+        getattr(member, "display_name", None),
+        getattr(member, "discriminator", None),
+    )
@@ -1,22 +1,29 @@
 # utils/cooldown.py
-# Simple per-user cooldown manager (in-memory).
+# Simple per-user cooldown manager (in-memory, bounded).
 import time
-from typing import Tuple, Dict
+from collections import OrderedDict
+from typing import Tuple
 
-# key: (guild_id, user_id) -> last_attempt_epoch
-_last_attempt: Dict[Tuple[int, int], float] = {}
+MAX_ENTRIES = 50_000  # oldest stamps are evicted beyond this
+
+# key: (guild_id, user_id) -> last_attempt (time.monotonic), oldest first
+_last_attempt: OrderedDict[Tuple[int, int], float] = OrderedDict()
 
 def remaining_cooldown(guild_id: int, user_id: int, cooldown_seconds: int) -> int:
     """Return remaining seconds if on cooldown, else 0."""
     if cooldown_seconds <= 0:
         return 0
-    key = (guild_id, user_id)
-    now = time.time()
-    last = _last_attempt.get(key, 0)
-    delta = now - last
+    last = _last_attempt.get((guild_id, user_id))
+    if last is None:
+        return 0
+    delta = time.monotonic() - last
     if delta < cooldown_seconds:
         return int(round(cooldown_seconds - delta))
     return 0
 
 def stamp_attempt(guild_id: int, user_id: int):
-    _last_attempt[(guild_id, user_id)] = time.time()
+    key = (guild_id, user_id)
+    _last_attempt[key] = time.monotonic()
+    _last_attempt.move_to_end(key)
+    if len(_last_attempt) > MAX_ENTRIES:
+        _last_attempt.popitem(last=False)
@@ -0,0 +1,17 @@
+# utils/fuzzy.py
+# Fuzzy "did you mean" helpers (rapidfuzz is a C extension, cheap enough for autocomplete).
+from typing import Iterable
+from rapidfuzz import process
+from rapidfuzz.distance import JaroWinkler
+
+def suggest(query: str, choices: Iterable[str], limit: int = 5, score_cutoff: float = 0.0) -> list[str]:
+    """Top `limit` choices by case-insensitive Jaro-Winkler similarity to `query`."""
+    matches = process.extract(
+        query,
+        list(choices),
+        scorer=JaroWinkler.similarity,
+        processor=str.upper,
+        limit=limit,
+        score_cutoff=score_cutoff
+    )
+    return [choice for choice, _, _ in matches]
@@ -0,0 +1,28 @@
+# utils/guild_cache.py
+# Per-guild lookup indexes kept in memory; rebuilt lazily after role events invalidate them.
+import discord
+
+# guild_id -> ({exact role name: role_id}, {lowercased role name: role_id})
+ROLE_BY_NAME: dict[int, tuple[dict[str, int], dict[str, int]]] = {}
+
+def index_roles(guild: discord.Guild) -> tuple[dict[str, int], dict[str, int]]:
+    """(Re)build the exact and lowercase name -> role id maps for a guild."""
+    exact: dict[str, int] = {}
+    folded: dict[str, int] = {}
+    for r in guild.roles:
+        exact.setdefault(r.name, r.id)  # first match wins, like discord.utils.get(name=...)
+        folded.setdefault(r.name.lower(), r.id)
+    ROLE_BY_NAME[guild.id] = (exact, folded)
+    return exact, folded
+
+def invalidate_roles(guild_id: int):
+    ROLE_BY_NAME.pop(guild_id, None)
+
+def role_by_name(guild: discord.Guild, name: str) -> discord.Role | None:
+    """O(1) role lookup by name: exact match first, then case-insensitive."""
+    index = ROLE_BY_NAME.get(guild.id)
+    if index is None:
+        index = index_roles(guild)
+    exact, folded = index
+    rid = exact.get(name) or folded.get(name.lower())
+    return guild.get_role(rid) if rid else None
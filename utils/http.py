@@ -0,0 +1,56 @@
+# utils/http.py
+# Shared aiohttp session (lazy, one per process) so outbound calls reuse pooled connections.
+import asyncio
+from typing import Any, Mapping
+import aiohttp
+import orjson
+
+GET_ATTEMPTS = 3       # tries for idempotent GETs on timeout / connection errors
+GET_BACKOFF = 0.1      # seconds; doubled after each failed try
+# Per-GET budget: fail fast on connect, bound a stalled read. Only for idempotent reads;
+# other calls (e.g. the auto-mc bridge POST) keep the session's plain total budget.
+_GET_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=3, sock_read=10)
+
+_session: aiohttp.ClientSession | None = None
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the shared ClientSession, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=10,
+                enable_cleanup_closed=True,
+                ttl_dns_cache=30
+            ),
+            timeout=aiohttp.ClientTimeout(total=15)
+        )
+    return _session
+
+async def get_json(url: str, **kwargs) -> tuple[int, Mapping[str, str], Any]:
+    """
+    GET `url` on the shared session and return (status, headers, decoded JSON or None
+    for an empty body). Timeouts and connection errors are retried with backoff.
+    """
+    session = await get_session()
+    for attempt in range(GET_ATTEMPTS):
+        try:
+            async with session.get(url, timeout=_GET_TIMEOUT, **kwargs) as resp:
+                body = await resp.read()
+                break
+        except (TimeoutError, aiohttp.ClientConnectionError):
+            if attempt == GET_ATTEMPTS - 1:
+                raise
+            await asyncio.sleep(GET_BACKOFF * 2 ** attempt)
+    try:
+        return resp.status, resp.headers, orjson.loads(body) if body else None
+    except orjson.JSONDecodeError:
+        raise RuntimeError(f"Non-JSON response ({resp.status}) from {url}") from None
+
+async def close_session():
+    """Close the shared session (call from the bot's shutdown)."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -7,11 +7,14 @@ Uses:
 """
 
 import os
-import aiohttp
 import re
+import time
+import asyncio
+from utils.cache import AsyncTTLCache
+from utils.http import get_json
 
 UUID_RE = re.compile(
-    r"^[0-9a-fA-F]{32}$|^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+    r"[0-9a-fA-F]{32}|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
 )
 # ===== API Keys & Base URLs =====
 HYPIXEL_API_KEY = os.getenv("HYPIXEL_API_KEY")
@@ -21,21 +24,59 @@ if not HYPIXEL_API_KEY:
 HYPIXEL_BASE = "https://api.hypixel.net/v2"
 MOJANG_PROFILE = "https://api.mojang.com/users/profiles/minecraft/{username}"
 SKYHELPER_BASE = "https://skyhelperapi.dev/api/v1/profiles"
+_AUTH_HEADERS = {"API-Key": HYPIXEL_API_KEY}  # shared, never mutated
 
 __all__ = ["username_to_uuid", "get_sb_stats", "hypixel_guild_by_player"]
 
+SB_STATS_TTL = 60  # seconds; admins often re-run /promote for the same IGN
+UUID_TTL = 3600  # seconds; username -> UUID mappings rarely change
+UUID_CACHE_MAX = 10_000
+UUID_MISS_TTL = 60  # seconds to remember unknown usernames
+RATE_LIMIT_LOW = 10  # remaining Hypixel requests considered "nearly exhausted"
+
+# Last rate-limit state reported by Hypixel for our key
+_rate_limit = {"remaining": None, "reset_at": 0.0}
+
+
+def _note_rate_limit(headers) -> None:
+    """Record RateLimit-Remaining / RateLimit-Reset (or Retry-After) from a Hypixel response."""
+    remaining = headers.get("RateLimit-Remaining")
+    reset = headers.get("RateLimit-Reset") or headers.get("Retry-After")
+    if remaining is not None and remaining.isdigit():
+        _rate_limit["remaining"] = int(remaining)
+    if reset is not None and reset.isdigit():
+        _rate_limit["reset_at"] = time.monotonic() + int(reset)
+
+
+def rate_limit_backoff() -> float:
+    """Seconds until the Hypixel key window resets if it is nearly exhausted, else 0."""
+    remaining = _rate_limit["remaining"]
+    if remaining is None or remaining > RATE_LIMIT_LOW:
+        return 0.0
+    return max(0.0, _rate_limit["reset_at"] - time.monotonic())
+
+
+# ===== Caching =====
+_sb_stats_cache = AsyncTTLCache(SB_STATS_TTL)
+_uuid_cache = AsyncTTLCache(UUID_TTL, maxsize=UUID_CACHE_MAX, negative_ttl=UUID_MISS_TTL)
+
 # ===== Mojang API =====
 async def username_to_uuid(username: str) -> str | None:
     """
     Resolve a Minecraft username to a UUID (no dashes).
-    Returns None if the username does not exist.
+    Returns None if the username does not exist. Cached per (case-insensitive) name.
     """
-    async with aiohttp.ClientSession() as session:
-        async with session.get(MOJANG_PROFILE.format(username=username), timeout=10) as resp:
-            if resp.status == 200:
-                data = await resp.json()
-                return data.get("id")
-            return None
+    return await _uuid_cache.get(username.lower(), lambda: _fetch_uuid(username))
+
+
+async def _fetch_uuid(username: str) -> str | None:
+    status, _, data = await get_json(MOJANG_PROFILE.format(username=username))
+    if status == 200 and data:
+        return data.get("id")
+    if status in (204, 404):
+        return None  # no such profile; cached for UUID_MISS_TTL
+    # 429 / 5xx etc.: raise so the cache drops it instead of remembering a false miss
+    raise RuntimeError(f"Mojang API error ({status}): {data}")
 
 
 # ===== Hypixel: Guild =====
@@ -51,31 +92,29 @@ async def hypixel_guild_by_player(user_or_uuid: str, api_key: str | None = None)
         raise RuntimeError("Missing Hypixel API key (env HYPIXEL_API_KEY or parameter api_key).")
 
     # Determine if UUID or username
-    if UUID_RE.match(user_or_uuid):
-        uuid = user_or_uuid.replace("-", "")
+    if UUID_RE.fullmatch(user_or_uuid):
+        uuid = user_or_uuid if len(user_or_uuid) == 32 else user_or_uuid.replace("-", "")
     else:
         uuid = await username_to_uuid(user_or_uuid)
         if not uuid:
             raise ValueError(f"Username '{user_or_uuid}' not found.")
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            f"{HYPIXEL_BASE}/guild",
-            params={"player": uuid},  # ✅ correct param name for Hypixel
-            headers={"API-Key": key},
-            timeout=15
-        ) as resp:
-
-            data = await resp.json()
-            if not data.get("success"):
-                raise RuntimeError(f"Hypixel API error: {data}")
-            return data.get("guild") or None
+    _, headers, data = await get_json(
+        f"{HYPIXEL_BASE}/guild",
+        params={"player": uuid},  # ✅ correct param name for Hypixel
+        headers=_AUTH_HEADERS if key == HYPIXEL_API_KEY else {"API-Key": key}
+    )
+    _note_rate_limit(headers)
+    if not data or not data.get("success"):
+        raise RuntimeError(f"Hypixel API error: {data}")
+    return data.get("guild") or None
 
 
 # ===== Hypixel & SkyHelper Stats =====
 async def get_sb_stats(username: str) -> dict:
     """
     Fetch SkyBlock stats for a player from Hypixel + SkyHelper APIs.
+    Results are cached for SB_STATS_TTL seconds per (case-insensitive) IGN.
 
     Returns:
         dict: {
@@ -92,51 +131,73 @@ async def get_sb_stats(username: str) -> dict:
         ValueError: if username not found or no SkyBlock profile exists.
         RuntimeError: if an API call fails.
     """
+    return await _sb_stats_cache.get(username.lower(), lambda: _fetch_sb_stats(username))
+
+
+async def _validate_hypixel_sb(uuid: str, username: str) -> None:
+    """Hypixel API: make sure the player's selected SkyBlock profile exists."""
+    _, headers, data = await get_json(
+        f"{HYPIXEL_BASE}/skyblock/profiles",
+        params={"uuid": uuid},
+        headers=_AUTH_HEADERS
+    )
+    _note_rate_limit(headers)
+    if not data or not data.get("success"):
+        raise RuntimeError(f"Hypixel API error: {data}")
+
+    profiles = data.get("profiles", [])
+    if not profiles:
+        raise ValueError(f"No SkyBlock profiles found for {username}.")
+
+    # Pick selected profile (or first if none marked selected)
+    profile = profiles[0]
+    for p in profiles:
+        if p.get("selected"):
+            profile = p
+            break
+    members = profile.get("members", {})
+    if uuid not in members:
+        raise ValueError(f"No member data found for {username} in selected profile.")
+
+
+async def _fetch_skyhelper(uuid: str) -> dict:
+    """SkyHelper API: detailed SkyBlock stats for a UUID."""
+    _, _, skyhelper_data = await get_json(f"{SKYHELPER_BASE}/{uuid}")
+    if not skyhelper_data or not skyhelper_data.get("success"):
+        raise RuntimeError(f"SkyHelper API error: {skyhelper_data}")
+    return skyhelper_data
+
+
+async def _fetch_sb_stats(username: str) -> dict:
     uuid = await username_to_uuid(username)
     if not uuid:
         raise ValueError(f"Username '{username}' not found.")
 
-    async with aiohttp.ClientSession() as session:
-        # --- Hypixel API: validate SkyBlock profile exists ---
-        async with session.get(
-            f"{HYPIXEL_BASE}/skyblock/profiles",
-            params={"uuid": uuid},
-            headers={"API-Key": HYPIXEL_API_KEY},
-            timeout=15
-        ) as resp:
-            data = await resp.json()
-            if not data.get("success"):
-                raise RuntimeError(f"Hypixel API error: {data}")
-
-            profiles = data.get("profiles", [])
-            if not profiles:
-                raise ValueError(f"No SkyBlock profiles found for {username}.")
-
-            # Pick selected profile (or first if none marked selected)
-            profile = next((p for p in profiles if p.get("selected")), profiles[0])
-            members = profile.get("members", {})
-            if uuid not in members:
-                raise ValueError(f"No member data found for {username} in selected profile.")
-
-        # --- SkyHelper API: get detailed SkyBlock stats ---
-        async with session.get(f"{SKYHELPER_BASE}/{uuid}", timeout=15) as resp:
-            skyhelper_data = await resp.json()
-            if not skyhelper_data.get("success"):
-                raise RuntimeError(f"SkyHelper API error: {skyhelper_data}")
-
-        # --- Parse stats ---
-        stats = {
-            "networth": int(skyhelper_data["data"]["networth"]["networth"]),
-            "sb_level": float(skyhelper_data["data"]["skyblock_level"]["level"]),
-            "skill_avg": float(skyhelper_data["data"]["skills"]["average_skill_level"]),
-            "slayer_xp": sum(slayer["xp"] for slayer in skyhelper_data["data"]["slayers"].values()),
-            "cata_lvl": float(skyhelper_data["data"]["dungeons"]["catacombs"]["level"]["level"]),
-            "rift_all_charms": (
-                skyhelper_data["data"]["rift"]["charms"]["completed"]
-                >= skyhelper_data["data"]["rift"]["charms"]["total"]
-            ),
-            "farm_weight": int(skyhelper_data["data"]["farming"]["weight"]),
-            "masteries": len(skyhelper_data["data"].get("masteries", []))
-        }
-
-        return stats
+    # SkyHelper only needs the UUID, so it runs while Hypixel validates the profile;
+    # Hypixel's errors still take precedence (they say why the player has no stats).
+    skyhelper_task = asyncio.create_task(_fetch_skyhelper(uuid))
+    try:
+        await _validate_hypixel_sb(uuid, username)
+    except BaseException:
+        skyhelper_task.cancel()
+        raise
+    skyhelper_data = await skyhelper_task
+
+    # --- Parse stats ---
+    d = skyhelper_data["data"]
+    charms = d["rift"]["charms"]
+    slayer_xp = 0
+    for slayer in d["slayers"].values():
+        slayer_xp += slayer["xp"]
+    stats = {
+        "networth": int(d["networth"]["networth"]),
+        "sb_level": float(d["skyblock_level"]["level"]),
+        "skill_avg": float(d["skills"]["average_skill_level"]),
+        "slayer_xp": slayer_xp,
+        "cata_lvl": float(d["dungeons"]["catacombs"]["level"]["level"]),
+        "rift_all_charms": charms["completed"] >= charms["total"],
+        "farm_weight": int(d["farming"]["weight"]),
+        "masteries": len(d.get("masteries", ()))
+    }
+
+    return stats
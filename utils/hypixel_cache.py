@@ -0,0 +1,37 @@
+# utils/hypixel_cache.py
+# TTL caches in front of Hypixel endpoints hit on every /ranksync.
+from types import MappingProxyType
+from typing import Mapping
+from utils.cache import AsyncTTLCache
+from utils.hypixel_api import hypixel_guild_by_player, rate_limit_backoff
+
+GUILD_TTL = 90  # seconds a guild snapshot is reused
+
+
+def _guild_ttl(guild) -> float:
+    # Near the key's quota, keep serving the snapshot until the window resets
+    return max(GUILD_TTL, rate_limit_backoff())
+
+
+_guild_cache = AsyncTTLCache(GUILD_TTL, ttl_for=_guild_ttl)
+
+
+async def _fetch_guild(uuid: str, api_key: str | None) -> Mapping | None:
+    guild = await hypixel_guild_by_player(uuid, api_key)
+    if not guild:
+        return None
+    # member uuid (no dashes) -> member entry, built once per snapshot
+    guild["_uuid_index"] = MappingProxyType({
+        (m.get("uuid") or "").replace("-", ""): m for m in guild.get("members") or []
+    })
+    # Shared by every caller until it expires, so hand out a read-only view
+    return MappingProxyType(guild)
+
+
+async def cached_hypixel_guild_by_player(uuid: str, api_key: str | None = None) -> Mapping | None:
+    """
+    hypixel_guild_by_player(uuid, api_key), cached per UUID for GUILD_TTL seconds.
+    The returned guild is read-only and carries a "_uuid_index" {uuid: member} map.
+    """
+    key = uuid.replace("-", "").lower()
+    return await _guild_cache.get(key, lambda: _fetch_guild(uuid, api_key))
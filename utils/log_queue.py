@@ -0,0 +1,113 @@
+# utils/log_queue.py
+# Log-channel messages are queued and flushed by one background task, so a handler
+# never waits on the log channel and bursts collapse into fewer REST calls.
+import asyncio
+import logging
+import discord
+
+logger = logging.getLogger("discord")
+
+FLUSH_WINDOW = 0.25   # seconds to wait for more lines after the first one
+MAX_CHARS = 1800      # stay under Discord's 2000-char message limit
+DRAIN_TIMEOUT = 5.0   # seconds stop_log_flusher waits for queued lines on shutdown
+
+# (channel_id, text)
+LOG_Q: asyncio.Queue[tuple[int, str]] = asyncio.Queue()
+
+def enqueue_log(channel_id: int, text: str):
+    """Queue a line for a log channel; returns immediately."""
+    LOG_Q.put_nowait((channel_id, text))
+
+# Strong refs for send_log_later tasks (the loop only keeps weak ones)
+_BACKGROUND_TASKS: set[asyncio.Task] = set()
+
+def _log_send_done(task: asyncio.Task):
+    _BACKGROUND_TASKS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background log send failed: %s", task.exception())
+
+def send_log_later(coro):
+    """Run a log-channel send (e.g. one with an embed) in the background; failures are logged."""
+    task = asyncio.create_task(coro)
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_log_send_done)
+
+def _chunks(lines: list[str]) -> list[str]:
+    out: list[str] = []
+    buf: list[str] = []
+    size = 0
+    for line in lines:
+        if buf and size + len(line) + 1 > MAX_CHARS:
+            out.append("\n".join(buf))
+            buf, size = [], 0
+        buf.append(line)
+        size += len(line) + 1
+    if buf:
+        out.append("\n".join(buf))
+    return out
+
+async def log_flusher(client: discord.Client):
+    """Drain LOG_Q forever, coalescing lines per channel within FLUSH_WINDOW."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await LOG_Q.get()]
+        size = len(batch[0][1])
+        deadline = loop.time() + FLUSH_WINDOW
+        while size < MAX_CHARS:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(LOG_Q.get(), remaining)
+            except TimeoutError:
+                break
+            batch.append(item)
+            size += len(item[1])
+
+        try:
+            await _send_batch(client, batch)
+        finally:
+            for _ in batch:
+                LOG_Q.task_done()  # lets stop_log_flusher's LOG_Q.join() see the batch finish
+
+async def _send_batch(client: discord.Client, batch: list[tuple[int, str]]):
+    by_channel: dict[int, list[str]] = {}
+    for ch_id, text in batch:
+        by_channel.setdefault(ch_id, []).append(text)
+
+    for ch_id, lines in by_channel.items():
+        ch = client.get_channel(ch_id)
+        if ch is None:
+            continue
+        for content in _chunks(lines):
+            try:
+                await ch.send(content)
+            except Exception:
+                # one bad send (network drop, non-messageable channel) must not end the flusher
+                logger.exception("Log channel %s send failed", ch_id)
+
+_FLUSHER: asyncio.Task | None = None
+
+def _flusher_done(client: discord.Client, task: asyncio.Task):
+    if task.cancelled():
+        return
+    logger.error("Log flusher stopped unexpectedly; restarting", exc_info=task.exception())
+    start_log_flusher(client)
+
+def start_log_flusher(client: discord.Client):
+    """Start the log_flusher task; it is restarted if it ever dies."""
+    global _FLUSHER
+    _FLUSHER = asyncio.create_task(log_flusher(client))
+    _FLUSHER.add_done_callback(lambda t: _flusher_done(client, t))
+
+async def stop_log_flusher(timeout: float = DRAIN_TIMEOUT):
+    """Let the flusher send what is queued (bounded by `timeout`), then cancel it."""
+    global _FLUSHER
+    task, _FLUSHER = _FLUSHER, None
+    if task is None:
+        return
+    try:
+        await asyncio.wait_for(LOG_Q.join(), timeout)
+    except TimeoutError:
+        logger.warning("Log flusher stopped with %d queued line(s) unsent", LOG_Q.qsize())
+    task.cancel()
@@ -1,12 +1,63 @@
 # utils/role_config.py
-import json
+import os
+import asyncio
+import threading
+import orjson
+from typing import Callable
 
 CONFIG_PATH = "config/role_requirements.json"
 
-def load_role_config():
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+def _make_checker(reqs: dict):
+    """Build check(stats) -> [failed requirement labels] with thresholds and messages baked in."""
+    nw, sb, sa = reqs["networth"], reqs["sb_level"], reqs["skill_avg"]
+    sxp, cl, fw = reqs["slayer_xp"], reqs["cata_lvl"], reqs["farm_weight"]
+    need_charms = reqs["rift_charms"] == "all"
+    m_nw, m_sb, m_sa = f"Networth < {nw:,}", f"SB Level < {sb}", f"Skill Avg < {sa}"
+    m_sxp, m_cl, m_fw = f"Slayer XP < {sxp:,}", f"Cata Lvl < {cl}", f"Farm Weight < {fw:,}"
+
+    def check(stats: dict) -> list[str]:
+        f = []
+        if stats["networth"] < nw: f.append(m_nw)
+        if stats["sb_level"] < sb: f.append(m_sb)
+        if stats["skill_avg"] < sa: f.append(m_sa)
+        if stats["slayer_xp"] < sxp: f.append(m_sxp)
+        if stats["cata_lvl"] < cl: f.append(m_cl)
+        if need_charms and not stats["rift_all_charms"]: f.append("Rift charms incomplete")
+        if stats["farm_weight"] < fw: f.append(m_fw)
+        return f
+    return check
+
+# (mtime_ns, data, thresholds ascending, ranks aligned with thresholds, requirements checker)
+_cache: tuple[int, dict, list[int], list[str], Callable[[dict], list[str]]] | None = None
+_lock = threading.Lock()  # load_role_config runs in worker threads (asyncio.to_thread)
+
+def _set_cache(mtime_ns: int, data: dict):
+    global _cache
+    ladder = sorted((int(k), v) for k, v in data["mastery_ranks"].items())
+    thresholds_asc = [t for t, _ in ladder]
+    ranks_asc = [r for _, r in ladder]
+    check = _make_checker(data["requirements"])
+    _cache = (mtime_ns, data, thresholds_asc, ranks_asc, check)
+
+def load_role_config() -> tuple[dict, list[int], list[str], Callable[[dict], list[str]]]:
+    """Return (config, thresholds_asc, ranks_asc, check); re-parsed only when the file changes."""
+    with _lock:
+        st = os.stat(CONFIG_PATH)
+        if not (_cache and _cache[0] == st.st_mtime_ns):
+            with open(CONFIG_PATH, "rb") as f:
+                _set_cache(st.st_mtime_ns, orjson.loads(f.read()))
+        return _cache[1:]
 
 def save_role_config(data):
-    with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    with _lock:
+        with open(CONFIG_PATH, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        _set_cache(os.stat(CONFIG_PATH).st_mtime_ns, data)  # next load is a stat, not a re-parse
+
+async def aload_role_config() -> tuple[dict, list[int], list[str], Callable[[dict], list[str]]]:
+    """load_role_config for async handlers; the stat/parse runs in a worker thread."""
+    return await asyncio.to_thread(load_role_config)
+
+async def asave_role_config(data):
+    """save_role_config for async handlers; the file write runs in a worker thread."""
+    await asyncio.to_thread(save_role_config, data)
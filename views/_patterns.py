@@ -0,0 +1,7 @@
+# views/_patterns.py
+# Compiled once; shared by every view that parses the promotion embed
+# (format written by commands/getroles.py::_build_promotion_embed).
+import re
+
+IGN_PATTERN = re.compile(r"IGN:\s*\*\*(.+?)\*\*", re.IGNORECASE)
+RANK_PATTERN = re.compile(r"Target Rank:\s*\*\*(.+?)\*\*", re.IGNORECASE)
@@ -1,10 +1,23 @@
 # views/promotion_view.py
-import re
+from functools import lru_cache
 import discord
 from utils.config import get_guild_cfg
-
-IGN_PATTERN = re.compile(r"IGN:\s*\*\*(.+?)\*\*", re.IGNORECASE)
-RANK_PATTERN = re.compile(r"Target Rank:\s*\*\*(.+?)\*\*", re.IGNORECASE)
+from utils.guild_cache import role_by_name
+from utils.log_queue import enqueue_log
+from views._patterns import IGN_PATTERN, RANK_PATTERN
+
+# Manage Roles or Administrator, tested with one AND on Permissions.value
+_STAFF_MASK = discord.Permissions.manage_roles.flag | discord.Permissions.administrator.flag
+
+@lru_cache(maxsize=256)
+def _parse_promo_embed(desc: str) -> tuple[str | None, str | None]:
+    """(ign, target rank) from a promotion embed description; None for a missing field."""
+    m_ign = IGN_PATTERN.search(desc)
+    m_rank = RANK_PATTERN.search(desc)
+    return (
+        m_ign.group(1).strip() if m_ign else None,
+        m_rank.group(1).strip() if m_rank else None,
+    )
 
 class PersistentPromotionApproveView(discord.ui.View):
     """
@@ -21,8 +34,7 @@ class PersistentPromotionApproveView(discord.ui.View):
     )
     async def approve(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Permission check
-        perms = interaction.user.guild_permissions
-        if not (perms.manage_roles or perms.administrator):
+        if not interaction.user.guild_permissions.value & _STAFF_MASK:
             return await interaction.response.send_message(
                 "You need **Manage Roles** to approve promotions.", ephemeral=True
             )
@@ -31,21 +43,15 @@ class PersistentPromotionApproveView(discord.ui.View):
         if not msg or not msg.embeds:
             return await interaction.response.send_message("No embed found on this message.", ephemeral=True)
 
-        embed = msg.embeds[0]
-        desc = embed.description or ""
-        m_ign = IGN_PATTERN.search(desc)
-        m_rank = RANK_PATTERN.search(desc)
-        if not m_ign or not m_rank:
+        ign, role_name = _parse_promo_embed(msg.embeds[0].description or "")
+        if ign is None or role_name is None:
             return await interaction.response.send_message("Missing IGN or target rank in the embed.", ephemeral=True)
 
-        ign = m_ign.group(1).strip()
-        role_name = m_rank.group(1).strip()
-
         if not msg.mentions:
             return await interaction.response.send_message("No target member mention found.", ephemeral=True)
         target_member = msg.mentions[0]
 
-        role = discord.utils.get(interaction.guild.roles, name=role_name)
+        role = role_by_name(interaction.guild, role_name)
         if not role:
             return await interaction.response.send_message(
                 f"Role **{role_name}** not found in this server.", ephemeral=True
@@ -61,16 +67,18 @@ class PersistentPromotionApproveView(discord.ui.View):
 
         # Assign role
         try:
-            if role not in target_member.roles:
+            if target_member.get_role(role.id) is None:
                 await target_member.add_roles(role, reason=f"Promotion approved by {interaction.user} (IGN {ign})")
         except discord.Forbidden:
             return await interaction.response.send_message("I don't have permission to edit that member.", ephemeral=True)
 
-        # Log
+        # Log (queued; flushed by the background log writer)
         cfg = get_guild_cfg(interaction.guild_id)
-        log_ch = interaction.guild.get_channel(int(cfg.get("log_channel_id") or 0))
+        log_ch_id = cfg["log_channel_id"]
+        log_ch = interaction.guild.get_channel(log_ch_id) if log_ch_id else None
         if log_ch:
-            await log_ch.send(
+            enqueue_log(
+                log_ch.id,
                 f"✅ **Promotion Approved** — {target_member.mention} → **{role.name}** "
                 f"(IGN **{ign}**, by {interaction.user.mention}) • "
                 f"[Jump]({msg.jump_url})"
@@ -87,31 +95,27 @@ class PersistentPromotionApproveView(discord.ui.View):
         custom_id="promo:reject"
     )
     async def reject(self, interaction: discord.Interaction, button: discord.ui.Button):
-        perms = interaction.user.guild_permissions
-        if not (perms.manage_roles or perms.administrator):
+        if not interaction.user.guild_permissions.value & _STAFF_MASK:
             return await interaction.response.send_message(
                 "You need **Manage Roles** to reject promotions.", ephemeral=True
             )
 
         # Log
         cfg = get_guild_cfg(interaction.guild_id)
-        log_ch = interaction.guild.get_channel(int(cfg.get("log_channel_id") or 0))
+        log_ch_id = cfg["log_channel_id"]
+        log_ch = interaction.guild.get_channel(log_ch_id) if log_ch_id else None
         msg = interaction.message
-        embed = msg.embeds[0] if (msg and msg.embeds) else None
-        ign = None
-        role_name = None
-        if embed:
-            desc = embed.description or ""
-            ig = IGN_PATTERN.search(desc)
-            rk = RANK_PATTERN.search(desc)
-            ign = ig.group(1).strip() if ig else None
-            role_name = rk.group(1).strip() if rk else None
+        ign, role_name = _parse_promo_embed(msg.embeds[0].description or "") if (msg and msg.embeds) else (None, None)
 
         if log_ch:
-            await log_ch.send(
+            enqueue_log(
+                log_ch.id,
                 f"❌ **Promotion Rejected** — IGN **{ign or 'Unknown'}**, "
                 f"target rank **{role_name or 'Unknown'}** • by {interaction.user.mention} • "
                 f"[Jump]({msg.jump_url if msg else ''})"
             )
 
         await interaction.response.send_message("❌ Promotion request rejected.", ephemeral=True)
+
+# Registered by Client.setup_hook
+PERSISTENT_VIEWS = [PersistentPromotionApproveView]
@@ -1,31 +1,39 @@
 # views/verification_view.py
 import os
-import aiohttp
 import discord
-from utils.config import get_guild_cfg, candidate_discord_names
+from utils.config import aget_guild_cfg, candidate_discord_names
+from utils.cache import AsyncTTLCache
 from utils.hypixel_api import username_to_uuid
+from utils.http import get_json
+from utils.log_queue import send_log_later
 
 HYPIXEL_API_KEY = os.getenv("HYPIXEL_API_KEY")
 HYPIXEL_BASE = "https://api.hypixel.net/v2"
+_AUTH_HEADERS = {"API-Key": HYPIXEL_API_KEY}  # shared, never mutated
 
 VERIFY_BUTTON_CUSTOM_ID = "verify:open"
+LINKED_TAG_TTL = 300      # seconds; links only change when the player runs /social
+LINKED_TAG_MISS_TTL = 30  # short, so "link your Discord, then retry" works right away
+
+_linked_tag_cache = AsyncTTLCache(LINKED_TAG_TTL, maxsize=4096, negative_ttl=LINKED_TAG_MISS_TTL)
 
 def _norm(s: str | None) -> str:
     return (s or "").strip().casefold()
 
+async def _linked_discord_tag(uuid: str) -> str | None:
+    """The player's linked Discord tag, cached per UUID."""
+    return await _linked_tag_cache.get(uuid, lambda: _fetch_linked_discord_tag(uuid))
+
 async def _fetch_linked_discord_tag(uuid: str) -> str | None:
     """Fetch the player's linked Discord tag from Hypixel /player."""
     if not HYPIXEL_API_KEY:
         raise RuntimeError("HYPIXEL_API_KEY not set")
-    headers = {"API-Key": HYPIXEL_API_KEY}
-    async with aiohttp.ClientSession() as session:
-        async with session.get(f"{HYPIXEL_BASE}/player", params={"uuid": uuid}, headers=headers, timeout=15) as resp:
-            data = await resp.json()
-            if resp.status == 200 and data.get("success"):
-                player = data.get("player") or {}
-                links = ((player.get("socialMedia") or {}).get("links") or {})
-                return links.get("DISCORD")
-            raise RuntimeError(f"Hypixel API /player error ({resp.status}): {data}")
+    status, _, data = await get_json(f"{HYPIXEL_BASE}/player", params={"uuid": uuid}, headers=_AUTH_HEADERS)
+    if status == 200 and data and data.get("success"):
+        player = data.get("player") or {}
+        links = ((player.get("socialMedia") or {}).get("links") or {})
+        return links.get("DISCORD")
+    raise RuntimeError(f"Hypixel API /player error ({status}): {data}")
 
 class VerifyModal(discord.ui.Modal, title="Hypixel Verification"):
     def __init__(self):
@@ -43,13 +51,14 @@ class VerifyModal(discord.ui.Modal, title="Hypixel Verification"):
         if not guild:
             return await interaction.response.send_message("Run verification inside a server.", ephemeral=True)
 
-        cfg = get_guild_cfg(guild.id)
-        verified_role_id = cfg.get("role_id")
-        log_channel_id = cfg.get("log_channel_id")
-
         ign = self.mc_name.value.strip()
         await interaction.response.defer(ephemeral=True, thinking=True)
 
+        # Read config only after the ack, so the thread hop never counts against the 3s window
+        cfg = await aget_guild_cfg(guild.id)
+        verified_role_id = cfg.get("role_id")
+        log_channel_id = cfg.get("log_channel_id")
+
         # Step 1 - Username -> UUID
         try:
             uuid = await username_to_uuid(ign)
@@ -60,15 +69,15 @@ class VerifyModal(discord.ui.Modal, title="Hypixel Verification"):
 
         # Step 2 - Linked Discord from Hypixel
         try:
-            linked_tag = await _fetch_linked_discord_tag(uuid)
+            linked_tag = await _linked_discord_tag(uuid)
         except Exception as e:
             return await interaction.followup.send(f"Error talking to Hypixel: {e}", ephemeral=True)
 
         candidates = candidate_discord_names(interaction.user)
         linked_norm = _norm(linked_tag)
 
-        # No linked Discord
-        if not linked_tag or linked_norm == "":
+        # No linked Discord (None, empty or whitespace-only all normalize to "")
+        if not linked_norm:
             try:
                 await interaction.user.send(
                     "No Discord is linked to your Hypixel account.\n"
@@ -112,10 +121,10 @@ class VerifyModal(discord.ui.Modal, title="Hypixel Verification"):
         granted_role = None
         role_error = None
         if verified_role_id and member:
-            role = guild.get_role(int(verified_role_id))
+            role = guild.get_role(verified_role_id)
             if role and me and me.top_role > role and guild.me.guild_permissions.manage_roles:
                 try:
-                    if role not in member.roles:
+                    if member.get_role(role.id) is None:
                         await member.add_roles(role, reason="Verified via Hypixel")
                         granted_role = role
                 except discord.Forbidden:
@@ -125,11 +134,11 @@ class VerifyModal(discord.ui.Modal, title="Hypixel Verification"):
             else:
                 role_error = "Verified role is higher or equal to bot's"
 
-        # Step 5 - Logging
+        # Step 5 - Logging (in the background; the user's ack doesn't wait on it)
         if log_channel_id:
-            ch = guild.get_channel(int(log_channel_id))
+            ch = guild.get_channel(log_channel_id)
             if isinstance(ch, discord.TextChannel):
-                await ch.send(embed=discord.Embed(
+                send_log_later(ch.send(embed=discord.Embed(
                     title="Verification Success",
                     description=(
                         f"User: {interaction.user.mention}\n"
@@ -139,7 +148,7 @@ class VerifyModal(discord.ui.Modal, title="Hypixel Verification"):
                         f"Role granted: {granted_role.mention if granted_role else 'None'} ({role_error or 'OK'})"
                     ),
                     color=discord.Color.green()
-                ))
+                )))
 
         # Step 6 - Acknowledge
         parts = [f"✅ Verified **{ign}** (linked to your Discord)."]
@@ -167,3 +176,6 @@ class VerifyView(discord.ui.View):
     async def open_verify(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Send modal dynamically — modals are never persistent
         await interaction.response.send_modal(VerifyModal())
+
+# Registered by Client.setup_hook
+PERSISTENT_VIEWS = [VerifyView]